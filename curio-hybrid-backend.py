@@ -3,13 +3,19 @@
 Loads enhanced static JSON data and optionally refreshes descriptions
 """
 
-import json
+import os
+import re
+import sys
+import mmap
 import asyncio
 import aiohttp
-import time
+import orjson
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
-from flask import Flask, jsonify, request, send_from_directory
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit, unquote
+import diskcache
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
 import logging
 
@@ -18,82 +24,199 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class CurioCatEnhancedBackend:
-    def __init__(self, static_data_file='data.json'):
+    # Curiosity keywords, matched as plain substrings in a single regex pass
+    CURIOSITY_KEYWORDS = (
+        'unusual', 'strange', 'bizarre', 'odd', 'weird', 'peculiar',
+        'mysterious', 'unexplained', 'controversial', 'banned', 'illegal',
+        'cult', 'conspiracy', 'hoax', 'urban legend', 'phenomenon',
+        'extinct', 'abandoned', 'secret', 'hidden', 'lost', 'ancient'
+    )
+    _KW_RE = re.compile('|'.join(re.escape(keyword) for keyword in CURIOSITY_KEYWORDS))
+    
+    def __init__(self, static_data_file='data.json', description_cache_dir='desc_cache'):
         self.static_data_file = static_data_file
         self.base_url = 'https://en.wikipedia.org/api/rest_v1'
         
-        # Description cache (only for real-time description updates)
-        self.description_cache = {}
+        # Parsed data cache, invalidated when the data file's mtime changes
+        self._data_cache = None
+        self._data_mtime = None
+        self._data_lock = threading.Lock()
+        
+        # Aggregates precomputed from the cached data on every reload
+        self._country_summary: Dict[str, Dict] = {}
+        self._global_summary: Dict = {}
+        self._country_index: Dict[str, Tuple[str, List[Dict]]] = {}
+        
+        # Countries list and stats change only with the data file, so keep them ready to serve
+        self._countries_info: List[Dict] = []
+        self._countries_json_bytes: Optional[bytes] = None
+        self._static_stats: Dict = {}
+        
+        # Description cache (only for real-time description updates), kept on disk
+        # so it survives restarts and is shared between server worker processes
         self.cache_duration = 1800  # 30 minutes cache for descriptions
+        self.description_cache = diskcache.Cache(description_cache_dir, size_limit=50_000_000)
+        self.max_concurrent_refreshes = 5  # In-flight Wikipedia requests per country request
         
         # Session for requests
         self.session_headers = {
             'User-Agent': 'wikiweird/1.0 (https://github.com/ameliatheamazin/wikiweird; ameliatheamazin@gmail.com)'
         }
     
-    def is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached description is still valid"""
-        if cache_key not in self.description_cache:
-            return False
-        
-        cache_time = self.description_cache[cache_key].get('timestamp', 0)
-        return (time.time() - cache_time) < self.cache_duration
-    
     def load_enhanced_data(self) -> Dict:
-        """Load the enhanced static JSON data with country identification"""
+        """Load the enhanced static JSON data, reusing the parsed copy until the file changes"""
         try:
-            with open(self.static_data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded enhanced data: {len(data)} countries")
-                return data
+            mtime = os.stat(self.static_data_file).st_mtime
         except FileNotFoundError:
             logger.error(f"Enhanced data file {self.static_data_file} not found")
             return {}
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing JSON from {self.static_data_file}: {e}")
-            return {}
+        
+        with self._data_lock:
+            if self._data_cache is not None and mtime == self._data_mtime:
+                return self._data_cache
+            
+            try:
+                # Parse straight from a read-only mapping instead of a bytes copy of the file
+                with open(self.static_data_file, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        data = orjson.loads(view)
+            except FileNotFoundError:
+                logger.error(f"Enhanced data file {self.static_data_file} not found")
+                return {}
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Error parsing JSON from {self.static_data_file}: {e}")
+                return {}
+            except ValueError as e:
+                # mmap refuses to map an empty file
+                logger.error(f"Error parsing JSON from {self.static_data_file}: {e}")
+                return {}
+            
+            self._country_summary, self._global_summary = self._process_articles(data)
+            self._country_index = self._build_country_index(data)
+            self._countries_info = self._build_countries_info(data)
+            self._countries_json_bytes = orjson.dumps({"countries": self._countries_info})
+            self._static_stats = self._build_static_stats(data, mtime)
+            self._data_cache = data
+            self._data_mtime = mtime
+            logger.info(f"Loaded enhanced data: {len(data)} countries")
+            return data
+    
+    def _process_articles(self, data: Dict) -> Tuple[Dict[str, Dict], Dict]:
+        """Score every article and compute per-country and overall aggregates in one pass"""
+        # Scores only depend on the static data, so compute them once per reload
+        loaded_at = datetime.now().isoformat()
+        
+        country_summary = {}
+        total_articles = 0
+        confidence_total = 0
+        all_regions = set()
+        
+        for country, articles in data.items():
+            regions = set()
+            categories = set()
+            confidence_sum = 0
+            confidence_min = None
+            confidence_max = None
+            
+            for article in articles:
+                # Regions, countries and categories repeat heavily; keep one shared copy of each
+                for key in ('source_region', 'identified_country'):
+                    value = article.get(key)
+                    if value:
+                        article[key] = sys.intern(value)
+                if article.get('categories'):
+                    article['categories'] = [sys.intern(cat) for cat in article['categories']]
+                
+                article['curiosity_score'] = self.calculate_curiosity_score(article)
+                article['last_processed'] = loaded_at
+                
+                confidence = article.get('country_confidence', 0)
+                confidence_sum += confidence
+                if confidence_min is None or confidence < confidence_min:
+                    confidence_min = confidence
+                if confidence_max is None or confidence > confidence_max:
+                    confidence_max = confidence
+                regions.add(article.get('source_region', 'Unknown'))
+                categories.update(article.get('categories', []))
+            
+            country_summary[country] = {
+                'article_count': len(articles),
+                'confidence_sum': confidence_sum,
+                'confidence_min': confidence_min,
+                'confidence_max': confidence_max,
+                'regions': regions,
+                'categories': categories
+            }
+            total_articles += len(articles)
+            confidence_total += confidence_sum
+            all_regions |= regions
+        
+        global_summary = {
+            'total_articles': total_articles,
+            'confidence_sum': confidence_total,
+            'regions': all_regions
+        }
+        return country_summary, global_summary
+    
+    def _build_country_index(self, data: Dict) -> Dict[str, Tuple[str, List[Dict]]]:
+        """Map lowercased country names to their actual name and articles"""
+        country_index = {}
+        for country, articles in data.items():
+            # Keep the first spelling, matching the old linear scan
+            country_index.setdefault(country.lower(), (country, articles))
+        return country_index
+    
+    def _find_country(self, country: str) -> Tuple[Optional[str], Optional[List[Dict]]]:
+        """Look up a country case-insensitively, returning its actual name and articles"""
+        if not self.load_enhanced_data():
+            return None, None
+        
+        return self._country_index.get(country.lower(), (None, None))
     
     def extract_wikipedia_title(self, url: str) -> str:
         """Extract the Wikipedia article title from URL"""
-        if '/wiki/' in url:
-            title = url.split('/wiki/')[-1]
-            # Handle URL encoding
-            title = title.replace('_', ' ')
-            # Handle fragments and parameters
-            if '#' in title:
-                title = title.split('#')[0]
-            if '?' in title:
-                title = title.split('?')[0]
-            return title.strip()
-        return ""
+        # urlsplit drops the query and fragment, unquote decodes %-escapes
+        path = urlsplit(url).path
+        if '/wiki/' not in path:
+            return ""
+        title = unquote(path.split('/wiki/', 1)[1])
+        return title.replace('_', ' ').strip()
     
-    async def get_fresh_description(self, title: str) -> Optional[str]:
-        """Get fresh description from Wikipedia API"""
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a pooled keep-alive session for Wikipedia API calls"""
+        connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=30)
+        return aiohttp.ClientSession(headers=self.session_headers, connector=connector)
+    
+    async def get_fresh_description(self, title: str,
+                                    session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
+        """Get fresh description from Wikipedia API, reusing the given session if any"""
         cache_key = f"desc_{title}"
         
-        if self.is_cache_valid(cache_key):
-            return self.description_cache[cache_key]['data']
+        cached_description = self.description_cache.get(cache_key)
+        if cached_description is not None:
+            return cached_description
+        
+        if session is None:
+            async with self._create_session() as session:
+                return await self.get_fresh_description(title, session)
         
         try:
-            clean_title = title.replace(' ', '_')
+            # Re-escape the decoded title so '?', '#', '%' and '/' stay part of the path
+            clean_title = quote(title.replace(' ', '_'), safe='')
             summary_url = f"{self.base_url}/page/summary/{clean_title}"
             
-            async with aiohttp.ClientSession(headers=self.session_headers) as session:
-                async with session.get(summary_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        description = data.get('description', '')
-                        
-                        # Cache the fresh description
-                        self.description_cache[cache_key] = {
-                            'data': description,
-                            'timestamp': time.time()
-                        }
-                        
-                        logger.debug(f"Fetched fresh description for {title}")
-                        return description
-                    else:
-                        logger.warning(f"Wikipedia API returned {response.status} for {title}")
+            async with session.get(summary_url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    description = data.get('description', '')
+                    
+                    # Cache the fresh description
+                    self.description_cache.set(cache_key, description, expire=self.cache_duration)
+                    
+                    logger.debug(f"Fetched fresh description for {title}")
+                    return description
+                else:
+                    logger.warning(f"Wikipedia API returned {response.status} for {title}")
         except Exception as e:
             logger.error(f"Error fetching description for {title}: {e}")
         
@@ -104,24 +227,15 @@ class CurioCatEnhancedBackend:
         score = 5  # Base score
         
         # Use enhanced data for scoring
-        title = article.get('title', '').lower()
-        description = article.get('description', '').lower()
+        title = article.get('title', '')
+        description = article.get('description', '')
         categories = article.get('categories', [])
         
-        # Combine text for analysis
-        text_content = f"{title} {description} {' '.join(categories)}".lower()
-        
-        # Curiosity keywords boost
-        curiosity_keywords = [
-            'unusual', 'strange', 'bizarre', 'odd', 'weird', 'peculiar',
-            'mysterious', 'unexplained', 'controversial', 'banned', 'illegal',
-            'cult', 'conspiracy', 'hoax', 'urban legend', 'phenomenon',
-            'extinct', 'abandoned', 'secret', 'hidden', 'lost', 'ancient'
-        ]
+        # Combine text for analysis, lowercasing the joined string only once
+        text_content = ' '.join((title, description, *categories)).lower()
         
-        for keyword in curiosity_keywords:
-            if keyword in text_content:
-                score += 1
+        # Curiosity keywords boost (each distinct keyword counts once)
+        score += len(set(self._KW_RE.findall(text_content)))
         
         # Country confidence boost (higher confidence = more reliable = slightly higher score)
         confidence = article.get('country_confidence', 0)
@@ -138,45 +252,51 @@ class CurioCatEnhancedBackend:
         # Cap at 10
         return min(score, 10)
     
-    async def refresh_article_description(self, article: Dict, refresh_description: bool = False) -> Dict:
-        """Optionally refresh article description with live data"""
-        enhanced_article = article.copy()
-        
-        if refresh_description:
-            # Extract Wikipedia title
-            wiki_title = self.extract_wikipedia_title(article.get('url', ''))
-            if not wiki_title:
-                wiki_title = article.get('title', '')
-            
-            if wiki_title:
-                try:
-                    fresh_description = await self.get_fresh_description(wiki_title)
-                    if fresh_description:
-                        enhanced_article['description'] = fresh_description
-                        enhanced_article['description_updated'] = datetime.now().isoformat()
-                        logger.debug(f"Updated description for {wiki_title}")
-                except Exception as e:
-                    logger.warning(f"Failed to refresh description for {wiki_title}: {e}")
-        
-        # Add computed fields using enhanced data
-        enhanced_article['curiosity_score'] = self.calculate_curiosity_score(enhanced_article)
-        enhanced_article['last_processed'] = datetime.now().isoformat()
-        
-        return enhanced_article
+    async def refresh_article_description(self, article: Dict, refresh_description: bool = False,
+                                          session: Optional[aiohttp.ClientSession] = None,
+                                          processed_at: Optional[str] = None) -> Dict:
+        """
+        Optionally refresh article description with live data.
+        
+        The cached article already carries its score and load time, so it is
+        returned as-is (and must be treated as read-only) unless a fresh
+        description replaces the stored one.
+        """
+        if not refresh_description:
+            return article
+        
+        # Extract Wikipedia title
+        wiki_title = self.extract_wikipedia_title(article.get('url', ''))
+        if not wiki_title:
+            wiki_title = article.get('title', '')
+        
+        if wiki_title:
+            try:
+                fresh_description = await self.get_fresh_description(wiki_title, session)
+                if fresh_description:
+                    # Callers processing a batch pass one shared timestamp
+                    if processed_at is None:
+                        processed_at = datetime.now().isoformat()
+                    
+                    enhanced_article = {
+                        **article,
+                        'description': fresh_description,
+                        'description_updated': processed_at,
+                        'last_processed': processed_at
+                    }
+                    # The score depends on the description, so recompute it
+                    enhanced_article['curiosity_score'] = self.calculate_curiosity_score(enhanced_article)
+                    logger.debug(f"Updated description for {wiki_title}")
+                    return enhanced_article
+            except Exception as e:
+                logger.warning(f"Failed to refresh description for {wiki_title}: {e}")
+        
+        return article
     
     async def get_country_data(self, country: str, refresh_descriptions: bool = False, limit: int = 20) -> List[Dict]:
         """Get articles for a specific country with optional description refresh"""
-        enhanced_data = self.load_enhanced_data()
-        
-        if not enhanced_data:
-            return []
-        
         # Find articles for the country (case-insensitive)
-        country_articles = None
-        for key, articles in enhanced_data.items():
-            if key.lower() == country.lower():
-                country_articles = articles
-                break
+        _, country_articles = self._find_country(country)
         
         if not country_articles:
             logger.info(f"No articles found for {country}")
@@ -187,24 +307,36 @@ class CurioCatEnhancedBackend:
         
         logger.info(f"Processing {len(articles_to_process)} articles for {country}")
         
-        # Process articles (with optional description refresh)
+        # One pooled session per request; it is bound to this request's event loop
+        session = self._create_session() if refresh_descriptions else None
+        processed_at = datetime.now().isoformat()
+        
+        # Refresh articles concurrently, bounded to stay polite to Wikipedia
+        semaphore = asyncio.Semaphore(self.max_concurrent_refreshes)
+        
+        async def process_article(article: Dict) -> Dict:
+            async with semaphore:
+                return await self.refresh_article_description(
+                    article, refresh_descriptions, session, processed_at
+                )
+        
+        try:
+            results = await asyncio.gather(
+                *(process_article(article) for article in articles_to_process),
+                return_exceptions=True
+            )
+        finally:
+            if session is not None:
+                await session.close()
+        
         processed_articles = []
-        for article in articles_to_process:
-            try:
-                enhanced = await self.refresh_article_description(article, refresh_descriptions)
-                processed_articles.append(enhanced)
-                
-                # Small delay between description fetches to be nice to Wikipedia
-                if refresh_descriptions:
-                    await asyncio.sleep(0.2)
-                    
-            except Exception as e:
-                logger.error(f"Failed to process article {article.get('title', 'unknown')}: {e}")
-                # Add article with computed fields only
-                fallback = article.copy()
-                fallback['curiosity_score'] = self.calculate_curiosity_score(article)
-                fallback['last_processed'] = datetime.now().isoformat()
-                processed_articles.append(fallback)
+        for article, result in zip(articles_to_process, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to process article {article.get('title', 'unknown')}: {result}")
+                # Fall back to the cached article with its precomputed score
+                processed_articles.append(article)
+            else:
+                processed_articles.append(result)
         
         # Sort by curiosity score, then by country confidence
         processed_articles.sort(
@@ -217,20 +349,13 @@ class CurioCatEnhancedBackend:
         
         return processed_articles
     
-    def get_all_countries(self) -> List[Dict]:
-        """Get list of all countries with metadata"""
-        enhanced_data = self.load_enhanced_data()
-        if not enhanced_data:
-            return []
-        
+    def _build_countries_info(self, data: Dict) -> List[Dict]:
+        """Build the country list with metadata from the precomputed aggregates"""
         countries_info = []
-        for country, articles in enhanced_data.items():
-            # Calculate country statistics
-            total_articles = len(articles)
-            avg_confidence = sum(art.get('country_confidence', 0) for art in articles) / total_articles if articles else 0
-            
-            # Count regions represented
-            regions = set(art.get('source_region', 'Unknown') for art in articles)
+        for country, articles in data.items():
+            summary = self._country_summary[country]
+            total_articles = summary['article_count']
+            avg_confidence = summary['confidence_sum'] / total_articles if total_articles else 0
             
             # Sample articles for preview
             sample_articles = [art.get('title', 'Unknown') for art in articles[:3]]
@@ -239,7 +364,7 @@ class CurioCatEnhancedBackend:
                 'country': country,
                 'article_count': total_articles,
                 'avg_confidence': round(avg_confidence, 2),
-                'regions': list(regions),
+                'regions': list(summary['regions']),
                 'sample_articles': sample_articles
             })
         
@@ -247,6 +372,42 @@ class CurioCatEnhancedBackend:
         countries_info.sort(key=lambda x: x['article_count'], reverse=True)
         return countries_info
     
+    def get_all_countries(self) -> List[Dict]:
+        """Get list of all countries with metadata"""
+        enhanced_data = self.load_enhanced_data()
+        if not enhanced_data:
+            return []
+        
+        return self._countries_info
+    
+    def get_countries_json(self) -> bytes:
+        """Get the serialized country list, encoded once per data file version"""
+        enhanced_data = self.load_enhanced_data()
+        if not enhanced_data:
+            return orjson.dumps({"countries": []})
+        
+        return self._countries_json_bytes
+    
+    def _build_static_stats(self, data: Dict, mtime: float) -> Dict:
+        """Build the statistics that only change when the data file does"""
+        # Comprehensive stats come from the aggregates built at load time
+        total_articles = self._global_summary['total_articles']
+        identified_articles = total_articles - len(data.get('Unidentified', []))
+        
+        avg_confidence = self._global_summary['confidence_sum'] / total_articles if total_articles else 0
+        identification_rate = (identified_articles / total_articles * 100) if total_articles > 0 else 0
+        
+        return {
+            "total_countries": len(data),
+            "total_articles": total_articles,
+            "identified_articles": identified_articles,
+            "unidentified_articles": len(data.get('Unidentified', [])),
+            "identification_rate": round(identification_rate, 1),
+            "avg_confidence": round(avg_confidence, 2),
+            "regions_covered": list(self._global_summary['regions']),
+            "last_updated": datetime.fromtimestamp(mtime).isoformat()
+        }
+    
     def get_stats(self) -> Dict:
         """Get overall statistics"""
         enhanced_data = self.load_enhanced_data()
@@ -260,80 +421,31 @@ class CurioCatEnhancedBackend:
                 "last_updated": "unknown"
             }
         
-        # Calculate comprehensive stats
-        total_articles = sum(len(articles) for articles in enhanced_data.values())
-        identified_articles = total_articles - len(enhanced_data.get('Unidentified', []))
-        
-        # Calculate average confidence
-        all_articles = []
-        for articles in enhanced_data.values():
-            all_articles.extend(articles)
-        
-        avg_confidence = sum(art.get('country_confidence', 0) for art in all_articles) / len(all_articles) if all_articles else 0
-        identification_rate = (identified_articles / total_articles * 100) if total_articles > 0 else 0
-        
-        # Get file modification time
-        try:
-            import os
-            last_updated = datetime.fromtimestamp(
-                os.path.getmtime(self.static_data_file)
-            ).isoformat()
-        except:
-            last_updated = "unknown"
-        
-        # Count regions
-        regions = set()
-        for articles in enhanced_data.values():
-            for article in articles:
-                regions.add(article.get('source_region', 'Unknown'))
-        
+        # Only the cache size is live; everything else was computed at load time
         return {
-            "total_countries": len(enhanced_data),
-            "total_articles": total_articles,
-            "identified_articles": identified_articles,
-            "unidentified_articles": len(enhanced_data.get('Unidentified', [])),
-            "identification_rate": round(identification_rate, 1),
-            "avg_confidence": round(avg_confidence, 2),
-            "regions_covered": list(regions),
-            "last_updated": last_updated,
+            **self._static_stats,
             "description_cache_size": len(self.description_cache)
         }
     
     def get_country_details(self, country: str) -> Optional[Dict]:
         """Get detailed information about a specific country"""
-        enhanced_data = self.load_enhanced_data()
-        
         # Find country (case-insensitive)
-        country_articles = None
-        actual_country_name = None
-        for key, articles in enhanced_data.items():
-            if key.lower() == country.lower():
-                country_articles = articles
-                actual_country_name = key
-                break
+        actual_country_name, country_articles = self._find_country(country)
         
         if not country_articles:
             return None
         
-        # Analyze articles for this country
-        regions = set()
-        categories = set()
-        confidence_scores = []
-        
-        for article in country_articles:
-            regions.add(article.get('source_region', 'Unknown'))
-            confidence_scores.append(article.get('country_confidence', 0))
-            for cat in article.get('categories', []):
-                categories.add(cat)
+        summary = self._country_summary[actual_country_name]
+        article_count = summary['article_count']
         
         return {
             'country': actual_country_name,
-            'article_count': len(country_articles),
-            'regions': list(regions),
-            'avg_confidence': round(sum(confidence_scores) / len(confidence_scores), 2) if confidence_scores else 0,
-            'min_confidence': round(min(confidence_scores), 2) if confidence_scores else 0,
-            'max_confidence': round(max(confidence_scores), 2) if confidence_scores else 0,
-            'top_categories': list(categories)[:20],  # Top 20 categories
+            'article_count': article_count,
+            'regions': list(summary['regions']),
+            'avg_confidence': round(summary['confidence_sum'] / article_count, 2) if article_count else 0,
+            'min_confidence': round(summary['confidence_min'], 2) if article_count else 0,
+            'max_confidence': round(summary['confidence_max'], 2) if article_count else 0,
+            'top_categories': list(summary['categories'])[:20],  # Top 20 categories
             'sample_articles': [
                 {
                     'title': art['title'],
@@ -352,6 +464,10 @@ backend = CurioCatEnhancedBackend()
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
+def ojsonify(obj):
+    """Serialize a response body with orjson instead of Flask's stdlib-based jsonify"""
+    return app.response_class(orjson.dumps(obj), mimetype='application/json')
+
 @app.route('/')
 def index():
     """Serve your HTML frontend"""
@@ -361,11 +477,10 @@ def index():
 def get_countries():
     """Get all available countries with metadata"""
     try:
-        countries = backend.get_all_countries()
-        return jsonify({"countries": countries})
+        return app.response_class(backend.get_countries_json(), mimetype='application/json')
     except Exception as e:
         logger.error(f"Error getting countries: {e}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 @app.route('/api/country/<country>')
 async def get_country_articles(country):
@@ -377,7 +492,7 @@ async def get_country_articles(country):
         # Get articles (with optional description refresh)
         articles = await backend.get_country_data(country, refresh_descriptions, limit)
         
-        return jsonify({
+        return ojsonify({
             "country": country,
             "articles": articles,
             "count": len(articles),
@@ -386,7 +501,7 @@ async def get_country_articles(country):
         })
     except Exception as e:
         logger.error(f"Error getting articles for {country}: {e}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 @app.route('/api/country/<country>/details')
 def get_country_details(country):
@@ -394,29 +509,29 @@ def get_country_details(country):
     try:
         details = backend.get_country_details(country)
         if details:
-            return jsonify(details)
+            return ojsonify(details)
         else:
-            return jsonify({"error": "Country not found"}), 404
+            return ojsonify({"error": "Country not found"}), 404
     except Exception as e:
         logger.error(f"Error getting details for {country}: {e}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 @app.route('/api/stats')
 def get_stats():
     """Get overall statistics"""
     try:
         stats = backend.get_stats()
-        return jsonify(stats)
+        return ojsonify(stats)
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
     try:
         enhanced_data = backend.load_enhanced_data()
-        return jsonify({
+        return ojsonify({
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "countries_loaded": len(enhanced_data),
@@ -424,7 +539,7 @@ def health_check():
             "data_file": backend.static_data_file
         })
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             "status": "unhealthy",
             "error": str(e),
             "timestamp": datetime.now().isoformat()
@@ -436,12 +551,12 @@ def clear_cache():
     try:
         cache_size = len(backend.description_cache)
         backend.description_cache.clear()
-        return jsonify({
+        return ojsonify({
             "message": f"Description cache cleared! Removed {cache_size} items",
             "cache_size": len(backend.description_cache)
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 if __name__ == "__main__":
     # Check if enhanced data exists
@@ -486,5 +601,7 @@ if __name__ == "__main__":
     print("  GET /api/clear-cache - Clear description cache")
     
     print("\n🐱 Frontend available at: http://localhost:5000")
+    print("   (development server - see the README for running under gunicorn)")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Debug mode is opt-in so the reloader and debugger never run by accident
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -4,16 +4,32 @@ Extracts unusual Wikipedia articles by region and enriches with metadata
 Includes intelligent country/territory identification
 """
 
-import requests
-import json
+import asyncio
+import aiohttp
+import diskcache
+import heapq
+import orjson
 import re
-from time import sleep
+import ahocorasick
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from aiolimiter import AsyncLimiter
 from typing import Dict, List, Optional, Tuple
+import logging
 import warnings
+from tqdm import tqdm
 from urllib.parse import unquote
 
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    """Whether text[index] exists and is a word character in the sense of regex \\b."""
+    return 0 <= index < len(text) and (text[index].isalnum() or text[index] == '_')
+
 
 class DataExtractor:
     """
@@ -21,22 +37,73 @@ class DataExtractor:
     organized by geographic regions with intelligent country mapping.
     """
     
-    def __init__(self, user_agent: str = 'wikiweird/1.0', rate_limit: float = 0.5):
+    # Transient API responses that are retried with exponential backoff
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    # Score above which a country that also doubles the runner-up ends the search early
+    DOMINANT_SCORE = 50
+    
+    # Special rules for commonly confused locations: (trigger substrings, country, bonus,
+    # region the rule is limited to, rival country whose rule firing cancels this one)
+    SPECIAL_LOCATION_RULES = (
+        # Hong Kong and Macau
+        (('hong kong',), 'Hong Kong', 50, None, None),
+        (('macau', 'macao'), 'Macau', 50, None, None),
+        # Taiwan vs China
+        (('taiwan', 'republic of china'), 'Taiwan', 40, None, None),
+        (('mainland china', "people's republic"), 'China', 40, None, 'Taiwan'),
+        # UK constituent countries
+        (('england', 'english', 'london'), 'United Kingdom', 30, None, None),
+        (('scotland', 'scottish', 'edinburgh'), 'United Kingdom', 30, None, None),
+        (('wales', 'welsh', 'cardiff'), 'United Kingdom', 30, None, None),
+        (('northern ireland',), 'United Kingdom', 30, None, None),
+        # US vs other North American countries
+        (('united states', ' usa ', ' us ', 'american'), 'United States', 25, 'North America', None),
+        (('canada', 'canadian'), 'Canada', 25, 'North America', 'United States'),
+    )
+    
+    def __init__(self, user_agent: str = 'wikiweird/1.0', max_requests_per_second: float = 10,
+                 max_concurrency: int = 10, cache_dir: str = 'wiki_cache',
+                 cache_ttl: int = 7 * 24 * 3600, scoring_workers: int = 0):
         """
         Initialize the Data Extractor.
         
         Args:
             user_agent (str): User agent string for API requests
-            rate_limit (float): Delay between API requests in seconds
+            max_requests_per_second (float): API request budget per second (0 disables pacing)
+            max_concurrency (int): Maximum number of article queries in flight at once
+            cache_dir (str): Directory of the on-disk article info cache
+            cache_ttl (int): Seconds a cached article info entry stays valid
+            scoring_workers (int): Worker processes for country scoring once fetching is
+                done (0 or 1 scores in this process)
         """
         self.api_url = 'https://en.wikipedia.org/w/api.php'
-        self.base_url = 'https://en.wikipedia.org/api/rest_v1'
         self.user_agent = user_agent
-        self.rate_limit = rate_limit
+        self.max_requests_per_second = max_requests_per_second
+        self.max_concurrency = max_concurrency
+        
+        # Titles per MediaWiki query; intro extracts are capped at 20 pages per request
+        self.batch_size = 20
         
-        # Initialize session with headers
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': self.user_agent})
+        # Retry policy for transient API failures
+        self.max_retries = 5
+        self.backoff_factor = 0.3
+        
+        # Token bucket shared by every API request, including retries and continuations;
+        # it allows short bursts and concurrency keeps the pipeline busy in between
+        self.limiter = (AsyncLimiter(max_rate=max_requests_per_second, time_period=1.0)
+                        if max_requests_per_second > 0 else None)
+        
+        # Article info already fetched by this or earlier runs, keyed by requested title
+        self.cache_dir = cache_dir
+        self.article_cache = diskcache.Cache(cache_dir)
+        self.cache_ttl = cache_ttl
+        
+        # Scoring is CPU-bound; with several regions it can use a process pool
+        self.scoring_workers = scoring_workers
+        
+        # HTTP session, opened by entering the extractor as an async context manager
+        self.session: Optional[aiohttp.ClientSession] = None
         
         # Define geographic regions
         self.regions = [
@@ -135,8 +202,146 @@ class DataExtractor:
             'file:', 'image:', 'category:', 'wp:', 'wikipedia:', 
             'template:', ':category:', 'commons:'
         ]
+        
+        # Precompiled link patterns; str.startswith takes the prefixes as one tuple
+        self._article_re = re.compile(r'\[\[([^|\]]+)(?:\|[^\]]+)?\]\]')
+        self._meta_re = re.compile(r'^(Category|Template|Help|Wikipedia):', re.IGNORECASE)
+        self._skip_prefixes = tuple(self.skip_prefixes)
+        
+        # Level-3 heading of any region, matched case-insensitively like the page headings
+        self._region_names = {region.lower(): region for region in self.regions}
+        self._region_heading_re = re.compile(
+            r'===\s*(' + '|'.join(re.escape(region) for region in self.regions) + r')\s*===',
+            re.IGNORECASE
+        )
+        
+        # Per region, countries get integer ids (the region's countries sorted, then the
+        # special-rule targets from outside it) so scores live in a preallocated list;
+        # the None entry serves sources without a country list
+        region_tables = {**self.region_countries, None: set()}
+        special_countries = {country for _, country, _, _, _ in self.SPECIAL_LOCATION_RULES}
+        self._region_country_names = {
+            region: sorted(countries) + sorted(special_countries - countries)
+            for region, countries in region_tables.items()
+        }
+        self._country_idx = {
+            region: {country: index for index, country in enumerate(names)}
+            for region, names in self._region_country_names.items()
+        }
+        self._region_country_ids = {
+            region: {country.lower(): self._country_idx[region][country] for country in countries}
+            for region, countries in region_tables.items()
+        }
+        
+        # Per region: one Aho-Corasick automaton over every country name, synonym and
+        # special-location trigger, so a single pass over the article text finds them all
+        self._region_automata = {
+            region: self._build_automaton(countries, self._country_idx[region])
+            for region, countries in region_tables.items()
+        }
+        self._region_category_automata = {
+            region: self._build_category_automaton(countries, self._country_idx[region])
+            for region, countries in self.region_countries.items()
+        }
+        self._region_synonyms = {
+            region: {synonym.lower(): self._country_idx[region][canonical]
+                     for synonym, canonical in self.country_synonyms.items() if canonical in countries}
+            for region, countries in region_tables.items()
+        }
+        self._region_special_rules = {
+            region: [
+                (frozenset(triggers), self._country_idx[region][country], bonus,
+                 self._country_idx[region][rival] if rival else None)
+                for triggers, country, bonus, only_region, rival in self.SPECIAL_LOCATION_RULES
+                if only_region in (None, region)
+            ]
+            for region in region_tables
+        }
+    
+    def _build_automaton(self, countries: set, country_idx: Dict[str, int]) -> ahocorasick.Automaton:
+        """
+        Build the multi-pattern matcher used by identify_countries_from_context.
+        
+        Each key maps to (term, country_id) where country_id identifies the country when
+        the term is a country in the region (counted as a word-bounded mention) and is None
+        for synonyms and special-location triggers (only their presence matters).
+        """
+        automaton = ahocorasick.Automaton()
+        terms = [synonym.lower() for synonym, canonical in self.country_synonyms.items()
+                 if canonical in countries]
+        terms.extend(term for triggers, _, _, _, _ in self.SPECIAL_LOCATION_RULES for term in triggers)
+        for term in terms:
+            automaton.add_word(term, (term, None))
+        # Country names last so a name that is also a synonym keeps its country
+        for country in countries:
+            country_lower = country.lower()
+            automaton.add_word(country_lower, (country_lower, country_idx[country]))
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_category_automaton(self, countries: set, country_idx: Dict[str, int]) -> ahocorasick.Automaton:
+        """
+        Build the matcher run over an article's joined categories.
+        
+        A country name maps to (length, country_id, 20); the contextual forms "in X",
+        "of X" and "X " map to (length, country_id, 30).
+        """
+        automaton = ahocorasick.Automaton()
+        for country in countries:
+            country_lower = country.lower()
+            automaton.add_word(country_lower, (len(country_lower), country_idx[country], 20))
+            for key in ('in ' + country_lower, 'of ' + country_lower, country_lower + ' '):
+                automaton.add_word(key, (len(key), country_idx[country], 30))
+        automaton.make_automaton()
+        return automaton
+    
+    async def __aenter__(self) -> 'DataExtractor':
+        """Open the pooled HTTP session used by the fetch coroutines."""
+        if self.session is None:
+            # One keep-alive pool sized for every concurrent query to the API host
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=64, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                headers={'User-Agent': self.user_agent}, connector=connector
+            )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        """Close the HTTP session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
     
-    def get_subpage_content(self, subpage_name: str) -> Optional[str]:
+    async def _get_json(self, params: Dict) -> Dict:
+        """
+        Query the MediaWiki API and decode the JSON response.
+        
+        Connection errors and transient statuses (see RETRY_STATUSES) are retried
+        up to max_retries times with exponential backoff; other errors are raised.
+        
+        Args:
+            params (Dict): Query string parameters
+            
+        Returns:
+            Dict: Decoded JSON response
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_factor * 2 ** (attempt - 1))
+            
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            
+            try:
+                async with self.session.get(self.api_url, params=params) as response:
+                    if response.status in self.RETRY_STATUSES and attempt < self.max_retries:
+                        continue
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+    
+    async def get_subpage_content(self, subpage_name: str) -> Optional[str]:
         """
         Fetch content from a Wikipedia subpage.
         
@@ -154,15 +359,15 @@ class DataExtractor:
                 'action': 'parse',
                 'page': full_page_name,
                 'format': 'json',
+                'formatversion': '2',
                 'prop': 'wikitext'
             }
             
-            response = self.session.get(self.api_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if 'parse' in data and 'wikitext' in data['parse']:
-                content = data['parse']['wikitext']['*']
+            # The page runs to megabytes: keep only the wikitext string, not the decoded envelope
+            data = await self._get_json(params)
+            content = data.get('parse', {}).get('wikitext')
+            del data
+            if content is not None:
                 print(f"✅ Successfully fetched ({len(content)} characters)")
                 return content
             else:
@@ -185,25 +390,16 @@ class DataExtractor:
             List[str]: List of unique article titles
         """
         # Find all wikilinks [[Article Name]] or [[Article Name|Display Text]]
-        article_pattern = r'\[\[([^|\]]+)(?:\|[^\]]+)?\]\]'
-        matches = re.findall(article_pattern, section_content)
-        
-        # Filter out non-article links
         articles = []
-        for match in matches:
-            article = match.strip()
-            if article and not any(article.lower().startswith(prefix) for prefix in self.skip_prefixes):
-                # Skip section headers and other meta content
-                if not re.match(r'^(Category|Template|Help|Wikipedia):', article, re.IGNORECASE):
-                    articles.append(article)
+        for match in self._article_re.finditer(section_content):
+            article = match.group(1).strip()
+            # Filter out non-article links, section headers and other meta content
+            if (article and not article.lower().startswith(self._skip_prefixes)
+                    and not self._meta_re.match(article)):
+                articles.append(article)
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_articles = []
-        for article in articles:
-            if article not in seen:
-                seen.add(article)
-                unique_articles.append(article)
+        unique_articles = list(dict.fromkeys(articles))
         
         print(f"   🔍 Found {len(unique_articles)} unique articles in {region_name}")
         if unique_articles:
@@ -227,15 +423,18 @@ class DataExtractor:
         geographic_articles = {}
         print("🔍 Looking for geographic sections...")
         
+        # One scan finds every region heading; each section runs to the next heading marker
+        sections = {}
+        for match in self._region_heading_re.finditer(content):
+            region = self._region_names[match.group(1).lower()]
+            if region not in sections:
+                end = content.find('===', match.end())
+                sections[region] = content[match.end():end if end != -1 else len(content)]
+        
         for region in self.regions:
-            # Create flexible pattern for region headers
-            region_escaped = re.escape(region)
-            pattern = rf'===\s*{region_escaped}\s*===(.*?)(?====|\Z)'
-            
-            match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+            section_content = sections.get(region)
             
-            if match:
-                section_content = match.group(1)
+            if section_content is not None:
                 print(f"✅ Found section: {region}")
                 print(f"   Section content length: {len(section_content)} characters")
                 
@@ -251,42 +450,88 @@ class DataExtractor:
         
         return geographic_articles
     
-    def get_article_categories(self, article_title: str) -> List[str]:
+    async def get_articles_info(self, article_titles: List[str]) -> Dict[str, Dict]:
         """
-        Get categories for an article to help identify its country/location.
+        Fetch summary data and categories for a batch of articles in one query.
+        
+        A single MediaWiki query returns the intro extract, description, thumbnail,
+        URL and categories for every title; continuation responses are merged.
+        Titles found in the article cache are not queried again until they expire.
         
         Args:
-            article_title (str): Title of the Wikipedia article
+            article_titles (List[str]): Up to batch_size article titles
             
         Returns:
-            List[str]: List of category names
+            Dict[str, Dict]: Article info keyed by requested title (missing pages omitted)
         """
-        try:
-            params = {
-                'action': 'query',
-                'format': 'json',
-                'titles': article_title,
-                'prop': 'categories',
-                'cllimit': 'max'
-            }
-            
-            response = self.session.get(self.api_url, params=params)
-            response.raise_for_status()
+        articles_info = {}
+        uncached_titles = []
+        for article_title in article_titles:
+            cached_info = self.article_cache.get(article_title)
+            if cached_info is not None:
+                articles_info[article_title] = cached_info
+            else:
+                uncached_titles.append(article_title)
+        
+        if not uncached_titles:
+            return articles_info
+        
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': '2',
+            'titles': '|'.join(uncached_titles),
+            'prop': 'extracts|pageimages|description|categories|info',
+            'exintro': '1',
+            'explaintext': '1',
+            'exlimit': 'max',
+            'piprop': 'thumbnail',
+            'pithumbsize': '330',
+            'pilimit': 'max',
+            'cllimit': 'max',
+            'inprop': 'url',
+            'redirects': '1'
+        }
+        
+        pages = {}
+        title_map = {}
+        request_params = params
+        while True:
+            data = await self._get_json(request_params)
             
-            data = response.json()
-            pages = data.get('query', {}).get('pages', {})
+            query = data.get('query', {})
+            for change in query.get('normalized', []) + query.get('redirects', []):
+                title_map[change['from']] = change['to']
             
-            categories = []
-            for page_data in pages.values():
-                if 'categories' in page_data:
-                    for cat in page_data['categories']:
-                        categories.append(cat['title'].replace('Category:', ''))
+            for page_data in query.get('pages', []):
+                page = pages.setdefault(page_data['title'], {'categories': []})
+                page['categories'].extend(page_data.pop('categories', []))
+                page.update(page_data)
             
-            return categories
+            if 'continue' not in data:
+                break
+            request_params = {**params, **data['continue']}
+        
+        for article_title in uncached_titles:
+            # Follow normalization, then redirects, to the page the API returned
+            resolved_title = title_map.get(article_title, article_title)
+            resolved_title = title_map.get(resolved_title, resolved_title)
+            page = pages.get(resolved_title)
+            if not page or 'pageid' not in page:
+                continue
             
-        except Exception as e:
-            print(f"   ⚠️ Error getting categories for {article_title}: {e}")
-            return []
+            articles_info[article_title] = {
+                'title': page['title'],
+                'description': page.get('description', ''),
+                # Keep the lead paragraph, like the REST summary extract
+                'extract': page.get('extract', '').split('\n', 1)[0],
+                'url': page.get('fullurl'),
+                'thumbnail': page.get('thumbnail', {}).get('source'),
+                'categories': [cat['title'].replace('Category:', '') for cat in page['categories']]
+            }
+            self.article_cache.set(article_title, articles_info[article_title], expire=self.cache_ttl)
+        
+        return articles_info
     
     def identify_country_from_context(self, article_title: str, article_extract: str, 
                                     categories: List[str], region: str) -> Tuple[Optional[str], float]:
@@ -302,98 +547,166 @@ class DataExtractor:
         Returns:
             Tuple[Optional[str], float]: (country_name, confidence_score)
         """
-        # Combine all text for analysis
-        full_text = f"{article_title} {article_extract} {' '.join(categories)}".lower()
-        
-        # Get potential countries from the region
-        region_countries = self.region_countries.get(region, set())
+        return self.identify_countries_from_context([(article_title, article_extract, categories)], region)[0]
+    
+    def identify_countries_from_context(self, articles: List[Tuple[str, str, List[str]]],
+                                        region: str) -> List[Tuple[Optional[str], float]]:
+        """
+        Identify the most likely country/territory for every article of a region.
         
-        country_scores = {}
+        Each stage scans the texts of all articles together: titles first, then
+        categories, then extracts. The extracts are usually the longest texts and
+        are only scanned for articles whose title and categories don't already
+        single out a dominant country.
         
-        # Score countries based on mentions in text
-        for country in region_countries:
-            score = 0.0
-            country_lower = country.lower()
-            
-            # Direct country name mentions
-            country_mentions = len(re.findall(rf'\b{re.escape(country_lower)}\b', full_text))
-            score += country_mentions * 10
-            
-            # Category-based scoring (higher weight)
-            for category in categories:
-                cat_lower = category.lower()
-                if country_lower in cat_lower:
-                    score += 20
-                    # Special patterns for locations
-                    if any(pattern in cat_lower for pattern in ['in ' + country_lower, 
-                                                               country_lower + ' ', 
-                                                               'of ' + country_lower]):
-                        score += 30
-            
-            # Title-based scoring
-            if country_lower in article_title.lower():
-                score += 15
+        Args:
+            articles (List[Tuple[str, str, List[str]]]): (title, extract, categories) per article
+            region (str): Source region
             
-            # Extract-based scoring  
-            if country_lower in article_extract.lower():
-                score += 5
+        Returns:
+            List[Tuple[Optional[str], float]]: (country_name, confidence_score) per article
+        """
+        tables = region if region in self.region_countries else None
+        automaton = self._region_automata[tables]
+        country_names = self._region_country_names[tables]
+        
+        # Lowercase every title and category once; extracts are lowered only if scanned
+        titles_lower = [title.lower() for title, _, _ in articles]
+        categories_lower = [[category.lower() for category in categories] for _, _, categories in articles]
+        
+        mention_counts = [[0] * len(country_names) for _ in articles]
+        
+        # Stage 1: titles
+        # Each stage's text keeps the spaces it had in the combined "title extract categories"
+        # text, so space-delimited triggers such as ' us ' still fire at the edges of a part
+        title_hits = self._scan_texts(automaton, [title + ' ' for title in titles_lower], mention_counts)
+        
+        # Stage 2: categories, as mentions and as category-based scores
+        category_hits = self._scan_texts(
+            automaton, [' ' + ' '.join(categories) for categories in categories_lower], mention_counts
+        )
+        category_scores = self._score_categories(tables, categories_lower, len(country_names))
+        
+        results = [(None, 0.0)] * len(articles)
+        pending = []
+        for index in range(len(articles)):
+            hits = title_hits[index] | category_hits[index]
+            country_scores = self._score_countries(tables, mention_counts[index], category_scores[index],
+                                                   title_hits[index], set(), hits)
             
-            if score > 0:
-                country_scores[country] = score
+            # Stop early when the title and categories already settle it
+            top, runner_up = heapq.nlargest(2, country_scores)
+            if top > self.DOMINANT_SCORE and top > 2 * runner_up:
+                results[index] = (country_names[country_scores.index(top)], 1.0)
+                continue
+            pending.append((index, hits))
         
-        # Also check synonyms
-        for synonym, canonical in self.country_synonyms.items():
-            if canonical in region_countries:
-                synonym_lower = synonym.lower()
-                if synonym_lower in full_text:
-                    country_scores[canonical] = country_scores.get(canonical, 0) + 8
+        # Stage 3: extracts of the articles still undecided
+        extract_hits = self._scan_texts(
+            automaton, [' ' + articles[index][1].lower() + ' ' for index, _ in pending],
+            [mention_counts[index] for index, _ in pending]
+        )
+        for (index, hits), article_extract_hits in zip(pending, extract_hits):
+            country_scores = self._score_countries(tables, mention_counts[index], category_scores[index],
+                                                   title_hits[index], article_extract_hits,
+                                                   hits | article_extract_hits)
+            # Return the country with highest score
+            top = max(country_scores)
+            if top > 0:
+                confidence = min(top / 50.0, 1.0)  # Normalize to 0-1
+                results[index] = (country_names[country_scores.index(top)], confidence)
         
-        # Special handling for cities/territories that are commonly misidentified
-        self._apply_special_location_rules(full_text, categories, country_scores, region)
+        return results
+    
+    @staticmethod
+    def _scan_texts(automaton: ahocorasick.Automaton, texts: List[str],
+                    mention_counts: List[List[int]]) -> List[set]:
+        """
+        Run one automaton pass over lowercased texts joined with NUL separators.
         
-        if not country_scores:
-            return None, 0.0
+        Match offsets are mapped back to their text. Country names count towards that
+        text's mention_counts only on word boundaries, longest name first. Returns,
+        per text, the set of every term found, boundaries or not.
+        """
+        blob = '\x00'.join(texts)
+        starts = list(accumulate((len(text) + 1 for text in texts[:-1]), initial=0))
+        hits = [set() for _ in texts]
+        spans = []
+        for end, (term, country_id) in automaton.iter(blob):
+            start = end - len(term) + 1
+            index = bisect_right(starts, start) - 1
+            hits[index].add(term)
+            if country_id is not None:
+                if not (_is_word_char(blob, start - 1) or _is_word_char(blob, end + 1)):
+                    spans.append((start, -len(term), index, country_id))
         
-        # Return the country with highest score
-        best_country = max(country_scores, key=country_scores.get)
-        confidence = min(country_scores[best_country] / 50.0, 1.0)  # Normalize to 0-1
+        covered = 0
+        for start, neg_length, index, country_id in sorted(spans):
+            if start >= covered:
+                mention_counts[index][country_id] += 1
+                covered = start - neg_length
+        return hits
+    
+    def _score_categories(self, tables: Optional[str], category_lists: List[List[str]],
+                          size: int) -> List[List[int]]:
+        """
+        Category-based scores from one pass over every article's lowercased categories: +20
+        for each category naming the country, +30 more when it reads "in X", "of X" or "X ...".
+        """
+        category_scores = [[0] * size for _ in category_lists]
+        category_automaton = self._region_category_automata.get(tables)
+        categories = [category for category_list in category_lists for category in category_list]
+        if category_automaton is None or not categories:
+            return category_scores
         
-        return best_country, confidence
+        owners = [index for index, category_list in enumerate(category_lists) for _ in category_list]
+        cat_blob = '\n'.join(categories)
+        cat_starts = list(accumulate((len(category) + 1 for category in categories[:-1]), initial=0))
+        scored = set()
+        for end, (key_length, country_id, bonus) in category_automaton.iter(cat_blob):
+            position = bisect_right(cat_starts, end - key_length + 1) - 1
+            if (position, country_id, bonus) not in scored:
+                scored.add((position, country_id, bonus))
+                category_scores[owners[position]][country_id] += bonus
+        return category_scores
     
-    def _apply_special_location_rules(self, full_text: str, categories: List[str], 
-                                    country_scores: Dict[str, float], region: str):
-        """Apply special rules for commonly confused locations."""
+    def _score_countries(self, tables: Optional[str], mention_counts: List[int],
+                         category_scores: List[int], title_hits: set, extract_hits: set,
+                         hits: set) -> List[float]:
+        """
+        Combine the per-signal results gathered so far into scores indexed by country id.
         
-        # Hong Kong and Macau
-        if 'hong kong' in full_text:
-            country_scores['Hong Kong'] = country_scores.get('Hong Kong', 0) + 50
-        if 'macau' in full_text or 'macao' in full_text:
-            country_scores['Macau'] = country_scores.get('Macau', 0) + 50
-            
-        # Taiwan vs China
-        if 'taiwan' in full_text or 'republic of china' in full_text:
-            country_scores['Taiwan'] = country_scores.get('Taiwan', 0) + 40
-        elif 'mainland china' in full_text or "people's republic" in full_text:
-            country_scores['China'] = country_scores.get('China', 0) + 40
-            
-        # UK constituent countries
-        if any(term in full_text for term in ['england', 'english', 'london']):
-            country_scores['United Kingdom'] = country_scores.get('United Kingdom', 0) + 30
-        if any(term in full_text for term in ['scotland', 'scottish', 'edinburgh']):
-            country_scores['United Kingdom'] = country_scores.get('United Kingdom', 0) + 30
-        if any(term in full_text for term in ['wales', 'welsh', 'cardiff']):
-            country_scores['United Kingdom'] = country_scores.get('United Kingdom', 0) + 30
-        if 'northern ireland' in full_text:
-            country_scores['United Kingdom'] = country_scores.get('United Kingdom', 0) + 30
-            
-        # US vs other North American countries
-        if region == 'North America':
-            if any(term in full_text for term in ['united states', ' usa ', ' us ', 'american']):
-                country_scores['United States'] = country_scores.get('United States', 0) + 25
-            elif any(term in full_text for term in ['canada', 'canadian']):
-                country_scores['Canada'] = country_scores.get('Canada', 0) + 25
+        Mentions and categories are combined in one zip over the id-indexed lists; the
+        remaining signals only touch the countries whose terms were actually found.
+        """
+        # Direct country name mentions and category-based scoring (higher weight)
+        country_scores = [mentions * 10.0 + category for mentions, category in zip(mention_counts, category_scores)]
+        
+        country_ids = self._region_country_ids[tables]
+        
+        # Title-based scoring
+        for country_lower in country_ids.keys() & title_hits:
+            country_scores[country_ids[country_lower]] += 15
+        
+        # Extract-based scoring
+        for country_lower in country_ids.keys() & extract_hits:
+            country_scores[country_ids[country_lower]] += 5
+        
+        # Also check synonyms
+        synonym_ids = self._region_synonyms[tables]
+        for synonym in synonym_ids.keys() & hits:
+            country_scores[synonym_ids[synonym]] += 8
+        
+        # Special handling for cities/territories that are commonly misidentified
+        fired = set()
+        for triggers, country_id, bonus, rival_id in self._region_special_rules[tables]:
+            if not triggers.isdisjoint(hits) and rival_id not in fired:
+                fired.add(country_id)
+                country_scores[country_id] += bonus
+        
+        return country_scores
     
-    def get_enhanced_article_info(self, article_title: str, region: str) -> Dict:
+    async def get_enhanced_article_info(self, article_title: str, region: str) -> Dict:
         """
         Get enhanced article info including intelligent country identification.
         
@@ -404,37 +717,96 @@ class DataExtractor:
         Returns:
             Dict: Enhanced article metadata with country identification
         """
-        try:
-            clean_title = article_title.replace(' ', '_')
-            summary_url = f"{self.base_url}/page/summary/{clean_title}"
-            response = self.session.get(summary_url)
-            
-            basic_info = {
-                'title': article_title,
-                'description': 'Unusual Wikipedia article',
-                'extract': '',
-                'url': f"https://en.wikipedia.org/wiki/{clean_title}",
-                'thumbnail': None
-            }
+        enhanced_articles = await self.get_enhanced_articles_info([article_title], region)
+        return enhanced_articles[0]
+    
+    async def get_enhanced_articles_info(self, article_titles: List[str], region: str) -> List[Dict]:
+        """
+        Get enhanced info for a batch of articles from the same region.
+        
+        Args:
+            article_titles (List[str]): Up to batch_size article titles
+            region (str): Source region
             
-            if response.status_code == 200:
-                data = response.json()
-                basic_info.update({
-                    'title': data.get('title', article_title),
-                    'description': data.get('description', ''),
-                    'extract': data.get('extract', ''),
-                    'url': data.get('content_urls', {}).get('desktop', {}).get('page', 
-                          f"https://en.wikipedia.org/wiki/{clean_title}"),
-                    'thumbnail': data.get('thumbnail', {}).get('source') if data.get('thumbnail') else None
-                })
+        Returns:
+            List[Dict]: Enhanced article metadata, in the order of article_titles
+        """
+        try:
+            articles_info = await self.get_articles_info(article_titles)
+        except Exception as e:
+            print(f"⚠️ Error getting article info for {', '.join(article_titles)}: {e}")
+            return [self._create_fallback_enhanced_info(title, region) for title in article_titles]
+        
+        return self._enhance_articles(article_titles, articles_info, region)
+    
+    def _enhance_articles(self, article_titles: List[str], articles_info: Dict[str, Dict], region: str,
+                          failed_titles: frozenset = frozenset()) -> List[Dict]:
+        """
+        Build enhanced info for articles of one region, identifying all their countries in one batch.
+        
+        Args:
+            article_titles (List[str]): Article titles from the region
+            articles_info (Dict[str, Dict]): Data from get_articles_info (missing pages omitted)
+            region (str): Source region
+            failed_titles (frozenset): Titles whose fetch failed; they get fallback info
             
-            # Get categories for better country identification
-            categories = self.get_article_categories(article_title)
+        Returns:
+            List[Dict]: Enhanced article metadata, in the order of article_titles
+        """
+        basic_infos = {
+            title: self._build_basic_info(title, articles_info.get(title))
+            for title in article_titles if title not in failed_titles
+        }
+        
+        # Identify the most likely country of every article in one pass per stage
+        identifications = dict(zip(basic_infos, self.identify_countries_from_context(
+            [(title, basic_info['extract'], basic_info['categories'])
+             for title, basic_info in basic_infos.items()],
+            region
+        )))
+        
+        return [
+            self._build_enhanced_info(title, basic_infos[title], region, *identifications[title])
+            if title in basic_infos else self._create_fallback_enhanced_info(title, region)
+            for title in article_titles
+        ]
+    
+    def _build_basic_info(self, article_title: str, article_info: Optional[Dict]) -> Dict:
+        """Merge fetched article data (None if the page is missing) over placeholder defaults."""
+        clean_title = article_title.replace(' ', '_')
+        basic_info = {
+            'title': article_title,
+            'description': 'Unusual Wikipedia article',
+            'extract': '',
+            'url': f"https://en.wikipedia.org/wiki/{clean_title}",
+            'thumbnail': None,
+            'categories': []
+        }
+        
+        if article_info is not None:
+            basic_info.update(article_info)
+            basic_info['url'] = article_info['url'] or f"https://en.wikipedia.org/wiki/{clean_title}"
+        
+        return basic_info
+    
+    def _build_enhanced_info(self, article_title: str, basic_info: Dict, region: str,
+                             country: Optional[str], confidence: float) -> Dict:
+        """
+        Build enhanced article info from basic article data and its identified country.
+        
+        Args:
+            article_title (str): Title of the Wikipedia article
+            basic_info (Dict): Data from _build_basic_info
+            region (str): Source region
+            country (Optional[str]): Identified country, None if unidentified
+            confidence (float): Confidence of the identification
             
-            # Identify the most likely country
-            country, confidence = self.identify_country_from_context(
-                article_title, basic_info['extract'], categories, region
-            )
+        Returns:
+            Dict: Enhanced article metadata with country identification
+        """
+        try:
+            # Categories help with country identification
+            categories = basic_info['categories']
             
             # Enhanced article info with location intelligence
             enhanced_info = {
@@ -451,8 +823,8 @@ class DataExtractor:
                 'country_confidence': round(confidence, 2),
                 'categories': categories[:10],  # Top 10 categories
                 'location_signals': {
-                    'has_geographic_categories': any('geography' in cat.lower() or 'location' in cat.lower() 
-                                                   for cat in categories),
+                    'has_geographic_categories': any('geography' in cat_lower or 'location' in cat_lower
+                                                   for cat_lower in map(str.lower, categories)),
                     'category_count': len(categories)
                 }
             }
@@ -483,10 +855,16 @@ class DataExtractor:
             }
         }
     
-    def organize_by_countries(self, regional_articles: Dict[str, List[str]]) -> Dict[str, List[Dict]]:
+    async def organize_by_countries(self, regional_articles: Dict[str, List[str]]) -> Dict[str, List[Dict]]:
         """
         Process articles and organize them by intelligently identified countries.
         
+        Each distinct title is fetched once, however many regions list it, in batched
+        queries that run concurrently (bounded by max_concurrency; each API request
+        is paced by the rate limiter). Once every fetch is done, countries are
+        identified per region in one batch and results are assigned in the original
+        region/article order.
+        
         Args:
             regional_articles (Dict[str, List[str]]): Articles organized by region
             
@@ -501,15 +879,61 @@ class DataExtractor:
         
         print(f"🌍 Processing {total_articles} articles with intelligent country identification...")
         
-        for region, articles in regional_articles.items():
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def fetch_batch(article_titles: List[str], progress: tqdm) -> Optional[Dict[str, Dict]]:
+            async with semaphore:
+                try:
+                    return await self.get_articles_info(article_titles)
+                except Exception as e:
+                    print(f"⚠️ Error getting article info for {', '.join(article_titles)}: {e}")
+                    return None
+                finally:
+                    progress.update(len(article_titles))
+        
+        # Titles listed under several regions are fetched once, then scored per region
+        unique_titles = list(dict.fromkeys(
+            title for articles in regional_articles.values() for title in articles
+        ))
+        
+        # One batched query per batch_size titles; all of them finish before scoring
+        batches = [
+            unique_titles[start:start + self.batch_size]
+            for start in range(0, len(unique_titles), self.batch_size)
+        ]
+        with tqdm(total=len(unique_titles), desc='Fetching', unit='art') as progress:
+            batch_results = await asyncio.gather(*(fetch_batch(titles, progress) for titles in batches))
+        
+        fetched_info = {}
+        failed_titles = set()
+        for titles, articles_info in zip(batches, batch_results):
+            if articles_info is None:
+                failed_titles.update(titles)
+            else:
+                fetched_info.update(articles_info)
+        
+        # Country identification runs once per region over all of its articles
+        region_jobs = [
+            (articles, {title: fetched_info[title] for title in articles if title in fetched_info},
+             region, frozenset(failed_titles.intersection(articles)))
+            for region, articles in regional_articles.items()
+        ]
+        if self.scoring_workers > 1:
+            # Workers rebuild the matchers from the class tables instead of unpickling them
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=self.scoring_workers, initializer=_init_scoring_worker,
+                                     initargs=(self.cache_dir,)) as pool:
+                all_results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _enhance_region, *job) for job in region_jobs
+                ))
+        else:
+            all_results = [self._enhance_articles(*job) for job in region_jobs]
+        
+        for (region, articles), region_results in zip(regional_articles.items(), all_results):
             print(f"\n📍 Processing {region} ({len(articles)} articles)")
             
-            for article_title in articles:
+            for article_title, article_info in zip(articles, region_results):
                 processed += 1
-                print(f"   🔍 {processed}/{total_articles}: {article_title}")
-                
-                # Get enhanced article info with country identification
-                article_info = self.get_enhanced_article_info(article_title, region)
                 
                 identified_country = article_info['identified_country']
                 
@@ -519,13 +943,13 @@ class DataExtractor:
                         country_articles[identified_country] = []
                     
                     country_articles[identified_country].append(article_info)
-                    print(f"      → {identified_country} (confidence: {article_info['country_confidence']})")
                 else:
                     # Low confidence or no identification - keep in unidentified list
+                    identified_country = 'Unidentified'
                     unidentified_articles.append(article_info)
-                    print(f"      → Unidentified (confidence: {article_info['country_confidence']})")
                 
-                sleep(self.rate_limit)
+                logger.debug("%d/%d: %s → %s (confidence: %s)", processed, total_articles, article_title,
+                             identified_country, article_info['country_confidence'])
         
         # Add unidentified articles to a special category
         if unidentified_articles:
@@ -537,18 +961,26 @@ class DataExtractor:
         """
         Save data to JSON file.
         
+        Countries are serialized and written one at a time, so only one country's
+        encoded bytes are held in memory alongside the data.
+        
         Args:
             data (Dict): Data to save
             filename (str): Output filename
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(b'{')
+                for index, (country, articles) in enumerate(data.items()):
+                    # Strip the braces around the single-key object, keeping its indented body
+                    fragment = orjson.dumps({country: articles}, option=orjson.OPT_INDENT_2)[2:-2]
+                    f.write((b',\n' if index else b'\n') + fragment)
+                f.write(b'\n}' if data else b'}')
             print(f"💾 Saved enhanced data to '{filename}'")
         except Exception as e:
             print(f"❌ Error saving to {filename}: {e}")
     
-    def process_all_data(self, max_articles_per_region: int = None) -> Dict[str, List[Dict]]:
+    async def process_all_data(self, max_articles_per_region: int = None) -> Dict[str, List[Dict]]:
         """
         Complete processing pipeline with intelligent country identification.
         
@@ -558,9 +990,12 @@ class DataExtractor:
         Returns:
             Dict[str, List[Dict]]: Complete dataset organized by identified countries
         """
+        if self.session is None:
+            async with self:
+                return await self.process_all_data(max_articles_per_region)
         
         # 1. Fetch subpage content
-        places_content = self.get_subpage_content("Places and infrastructure")
+        places_content = await self.get_subpage_content("Places and infrastructure")
         if not places_content:
             print("❌ Failed to get content - stopping here")
             return {}
@@ -582,7 +1017,7 @@ class DataExtractor:
         print(f"Total articles: {total_articles}")
         
         # 3. Organize by intelligently identified countries
-        country_articles = self.organize_by_countries(regional_articles)
+        country_articles = await self.organize_by_countries(regional_articles)
         
         return country_articles
     
@@ -621,13 +1056,29 @@ class DataExtractor:
             print("  These articles need manual review for country assignment")
 
 
+# Extractor of a scoring worker process, built once by the pool initializer
+_scoring_extractor: Optional[DataExtractor] = None
+
+
+def _init_scoring_worker(cache_dir: str):
+    """Build the per-process extractor whose matchers score the regions sent to this worker."""
+    global _scoring_extractor
+    _scoring_extractor = DataExtractor(max_requests_per_second=0, cache_dir=cache_dir)
+
+
+def _enhance_region(article_titles: List[str], articles_info: Dict[str, Dict], region: str,
+                    failed_titles: frozenset) -> List[Dict]:
+    """Process pool entry point for DataExtractor._enhance_articles."""
+    return _scoring_extractor._enhance_articles(article_titles, articles_info, region, failed_titles)
+
+
 def main():
     """Main execution function."""
     # Initialize enhanced extractor
-    extractor = DataExtractor(rate_limit=0.8)  # Slightly slower for API stability
+    extractor = DataExtractor(max_requests_per_second=8)  # Slightly slower for API stability
     
     # Process all data (limit for demo - remove limit for full processing)
-    data = extractor.process_all_data(max_articles_per_region=5)
+    data = asyncio.run(extractor.process_all_data(max_articles_per_region=5))
     
     # Save to JSON
     if data: